@@ -4,18 +4,37 @@ A tool to monitor Elite Dangerous journal files and announce valuable asteroid f
 """
 
 import os
+import csv
 import json
 import time
 import re
+import fnmatch
 import logging
-import pandas as pd
+import numpy as np
 from datetime import datetime
 import pyttsx3
+import win32api
 import win32file
 import win32con
+import win32event
+import pythoncom
 from pathlib import Path
 import traceback
 import threading
+import queue
+
+# Prefer orjson for parsing journal lines, falling back to the standard
+# library; both accept raw bytes, so lines are never decoded to str first
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Numba is optional; without it the per-material aggregation uses NumPy
+try:
+    import numba
+except ImportError:
+    numba = None
 
 # Setup logging
 def setup_logger():
@@ -46,25 +65,95 @@ DEFAULT_CONFIG = {
 
 CONFIG_FILE = "config.json"
 STATS_FILE = "mining_statistics.csv"
+STATS_COLUMNS = [
+    'timestamp', 'material', 'proportion', 'motherlode',
+    'content_type', 'remaining'
+]
+STATS_INITIAL_CAPACITY = 1024  # rows preallocated in the numeric stats columns
+PROPORTION_SCALE = 10  # proportions are held in memory as integer tenths of a percent
+READ_CHUNK_SIZE = 65536  # bytes per ReadFile call on the journal
+JOURNAL_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+STATUS_INTERVAL = 60  # seconds between processed-asteroid summaries
+CONSOLE_CLOSE_WAIT = 4  # seconds to let stats flush on console close; Windows allows 5
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _aggregate_materials(codes, proportion, motherlode, n_materials):
+        """Count, sum and max of proportion plus motherlode count per material code."""
+        count = np.zeros(n_materials, np.int64)
+        total = np.zeros(n_materials, np.float64)
+        peak = np.full(n_materials, -np.inf)
+        motherlodes = np.zeros(n_materials, np.int64)
+        for i in range(codes.shape[0]):
+            c = codes[i]
+            count[c] += 1
+            total[c] += proportion[i]
+            if proportion[i] > peak[c]:
+                peak[c] = proportion[i]
+            if motherlode[i]:
+                motherlodes[c] += 1
+        return count, total, peak, motherlodes
+else:
+    def _aggregate_materials(codes, proportion, motherlode, n_materials):
+        """Count, sum and max of proportion plus motherlode count per material code."""
+        count = np.bincount(codes, minlength=n_materials)
+        total = np.bincount(codes, weights=proportion, minlength=n_materials)
+        peak = np.full(n_materials, -np.inf)
+        np.maximum.at(peak, codes, proportion)
+        motherlodes = np.bincount(codes, weights=motherlode, minlength=n_materials).astype(np.int64)
+        return count, total, peak, motherlodes
+
+def _fast_now():
+    """Return the current UTC time in the journal's timestamp format."""
+    return time.strftime(JOURNAL_TIMESTAMP_FORMAT, time.gmtime())
+
+def _make_checker(targets):
+    """Build a check(name, proportion) function specialized to the target thresholds."""
+    # Straight-line comparisons against constants: no per-material lookup in
+    # the targets dict. Thresholds are bound in the namespace rather than
+    # written as literals, since repr() of inf or nan is not valid source
+    lines = ["def check(name, proportion):"]
+    namespace = {}
+    for i, (name, threshold) in enumerate(targets.items()):
+        namespace[f"t{i}"] = float(threshold)
+        lines.append(f"    if name == {str(name)!r}: return proportion >= t{i}")
+    lines.append("    return False")
+    exec("\n".join(lines), namespace)
+    return namespace['check']
 
 class EliteAsteroidTracker:
     def __init__(self):
-        """Initialize the asteroid tracker with configuration and TTS engine."""
+        """Initialize the asteroid tracker with configuration and TTS speaker."""
         try:
             self.load_config()
             
-            # Initialize TTS engine
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', self.config['voice_rate'])
-            self.engine.setProperty('volume', self.config['voice_volume'])
+            # The TTS engine is created by the speaker thread on its first
+            # announcement, so launches that never speak skip SAPI start-up.
+            # That thread is the only one touching the engine, which also
+            # serializes every call into it
+            self._engine = None
+            self._speak_q = queue.Queue()
+            threading.Thread(target=self._speaker_loop, daemon=True).start()
             
-            # Initialize stats tracking
-            self.stats = self.load_stats()
+            # Initialize stats tracking; new rows are appended to the CSV as
+            # they arrive, and the CSV is only parsed when stats are displayed
+            self._stats_loaded = False
+            self.reset_stats()
+            self.open_stats_writer()
             
             # File tracking variables
             self.current_journal_path = None
+            self._handle = None
             self.last_position = 0
-            self.last_line = ""
+            self._tail = bytearray()
+            self.start_journal_watcher()
+            
+            # Journal event handlers; only lines naming one of these events
+            # are JSON-parsed, the rest are rejected with a byte search
+            self._handlers = {
+                'ProspectedAsteroid': self.process_asteroid
+            }
+            self._event_tags = tuple(f'"{event}"'.encode() for event in self._handlers)
             
             logger.info("EliteAsteroidTracker initialized successfully")
         except Exception as e:
@@ -75,61 +164,124 @@ class EliteAsteroidTracker:
     def load_config(self):
         """Load configuration from file or create with defaults if not exists."""
         try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r') as f:
-                    self.config = json.load(f)
+            config_path = Path(CONFIG_FILE)
+            if config_path.exists():
+                self.config = _loads(config_path.read_bytes())
                 logger.info("Configuration loaded from file")
             else:
                 self.config = DEFAULT_CONFIG
-                with open(CONFIG_FILE, 'w') as f:
-                    json.dump(self.config, indent=4, sort_keys=True, f)
+                config_path.write_text(json.dumps(self.config, indent=4, sort_keys=True))
                 logger.info("Default configuration created")
         except Exception as e:
             logger.error(f"Error loading configuration: {e}")
             logger.error(traceback.format_exc())
             self.config = DEFAULT_CONFIG
+        
+        # Compile the journal filename pattern once instead of on every poll
+        self._journal_re = re.compile(fnmatch.translate(self.config['file_pattern']))
+        self._check_material = _make_checker(self.config['target_materials'])
+    
+    def reset_stats(self):
+        """Empty the in-memory statistics columns."""
+        # Structure of arrays: numeric columns are preallocated NumPy arrays
+        # filled up to self._n, string columns are plain lists
+        self._n = 0
+        self._cols = {
+            'timestamp': [],
+            'material': [],
+            'proportion': np.empty(STATS_INITIAL_CAPACITY, np.uint16),
+            'motherlode': np.empty(STATS_INITIAL_CAPACITY, np.bool_),
+            'content_type': [],
+            'remaining': np.empty(STATS_INITIAL_CAPACITY, np.float32)
+        }
+    
+    def append_stat(self, timestamp, material, proportion, is_motherlode, content_type, remaining):
+        """Store one statistics row, growing the numeric columns geometrically."""
+        cols = self._cols
+        n = self._n
+        if n == len(cols['proportion']):
+            for name in ('proportion', 'motherlode', 'remaining'):
+                cols[name] = np.resize(cols[name], 2 * n)
+        
+        cols['timestamp'].append(timestamp)
+        cols['material'].append(material)
+        cols['proportion'][n] = round(proportion * PROPORTION_SCALE)
+        cols['motherlode'][n] = is_motherlode
+        cols['content_type'].append(content_type)
+        cols['remaining'][n] = remaining
+        self._n = n + 1
     
     def load_stats(self):
-        """Load existing statistics or create new DataFrame."""
+        """Load existing statistics from the CSV file into the columns."""
+        # Once the writer has drained, the CSV holds every row recorded so
+        # far, so it replaces whatever is in memory
+        self._write_q.join()
+        self.reset_stats()
         try:
             if os.path.exists(STATS_FILE):
-                stats = pd.read_csv(STATS_FILE)
-                logger.info(f"Statistics loaded: {len(stats)} records")
-                return stats
+                with open(STATS_FILE, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        self.append_stat(
+                            row['timestamp'],
+                            row['material'],
+                            float(row['proportion']),
+                            row['motherlode'] == 'True',
+                            row['content_type'],
+                            float(row['remaining'])
+                        )
+                logger.info(f"Statistics loaded: {self._n} records")
             else:
-                stats = pd.DataFrame(columns=[
-                    'timestamp', 'material', 'proportion', 'motherlode',
-                    'content_type', 'remaining'
-                ])
-                logger.info("New statistics dataframe created")
-                return stats
+                logger.info("New statistics store created")
         except Exception as e:
             logger.error(f"Error loading statistics: {e}")
             logger.error(traceback.format_exc())
-            return pd.DataFrame(columns=[
-                'timestamp', 'material', 'proportion', 'motherlode',
-                'content_type', 'remaining'
-            ])
+            self.reset_stats()
+        self._stats_loaded = True
+    
+    def open_stats_writer(self):
+        """Open the statistics CSV once in append mode for row-by-row writes."""
+        self._csv_file = open(STATS_FILE, 'a', newline='', encoding='utf-8')
+        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=STATS_COLUMNS)
+        if self._csv_file.tell() == 0:
+            self._csv_writer.writeheader()
+            self._csv_file.flush()
+        
+        # Rows are written by a background thread so disk I/O stays off the
+        # journal polling loop
+        self._write_q = queue.Queue()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+    
+    def _writer_loop(self):
+        """Write queued statistics rows to the CSV file."""
+        while True:
+            row = self._write_q.get()
+            try:
+                self._csv_writer.writerow(row)
+                self._csv_file.flush()
+            except Exception as e:
+                logger.error(f"Error writing statistics row: {e}")
+                logger.error(traceback.format_exc())
+            finally:
+                self._write_q.task_done()
     
     def save_stats(self):
-        """Save the statistics to CSV file."""
+        """Wait until every queued statistics row has been written."""
         try:
-            self.stats.to_csv(STATS_FILE, index=False)
-            logger.debug(f"Statistics saved: {len(self.stats)} records")
+            self._write_q.join()
+            logger.debug(f"Statistics saved to {STATS_FILE}")
         except Exception as e:
             logger.error(f"Error saving statistics: {e}")
             logger.error(traceback.format_exc())
     
-    def find_latest_journal(self):
-        """Find the latest journal file in the configured directory."""
+    def scan_latest_journal(self):
+        """Scan the configured directory and return the newest journal file."""
         try:
-            pattern = re.compile(self.config['file_pattern'].replace('.', '\.').replace('*', '.*'))
             journal_files = []
             
             # Use pathlib for more reliable file listing
             p = Path(self.config['journal_dir'])
-            for file in p.glob("Journal*.log"):
-                if pattern.match(file.name):
+            for file in p.iterdir():
+                if self._journal_re.match(file.name):
                     journal_files.append((file, file.stat().st_mtime))
             
             if not journal_files:
@@ -138,13 +290,114 @@ class EliteAsteroidTracker:
                 
             # Sort by modification time (newest first)
             journal_files.sort(key=lambda x: x[1], reverse=True)
-            latest_file = str(journal_files[0][0])
+            return str(journal_files[0][0])
+            
+        except FileNotFoundError:
+            # iterdir() raises where the old glob() found nothing; keep the
+            # single warning so retries do not flood the log with tracebacks
+            logger.warning("No journal files found")
+            return None
+        except Exception as e:
+            logger.error(f"Error scanning for journals: {e}")
+            logger.error(traceback.format_exc())
+            return None
+    
+    def start_journal_watcher(self):
+        """Start a background thread that tracks the newest journal file."""
+        self._latest_journal = None
+        self._watcher_active = False
+        # Auto-reset event pulsed on every directory change, and a manual-reset
+        # event that ends the monitoring loop
+        self._journal_changed = win32event.CreateEvent(None, False, False, None)
+        self._stop_event = win32event.CreateEvent(None, True, False, None)
+        threading.Thread(target=self._watch_journal_dir, daemon=True).start()
+    
+    def _watch_journal_dir(self):
+        """Rescan the journal directory only when Windows reports a new or renamed file."""
+        # File creation and renames are the only changes that can make another
+        # journal the newest, so only they trigger a rescan; plain writes just
+        # wake the reader
+        try:
+            name_handle = win32file.FindFirstChangeNotification(
+                self.config['journal_dir'], False, win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+            )
+        except Exception as e:
+            logger.error(f"Journal directory watcher unavailable, falling back to polling: {e}")
+            return
+        try:
+            write_handle = win32file.FindFirstChangeNotification(
+                self.config['journal_dir'], False, win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+            )
+        except Exception as e:
+            logger.error(f"Journal directory watcher unavailable, falling back to polling: {e}")
+            win32file.FindCloseChangeNotification(name_handle)
+            return
+        
+        try:
+            # Seed state after the notifications are armed so no change is missed
+            self._latest_journal = self.scan_latest_journal()
+            self._watcher_active = True
+            logger.info("Journal directory watcher started")
+            
+            while True:
+                result = win32event.WaitForMultipleObjects(
+                    [name_handle, write_handle], False, win32event.INFINITE
+                )
+                if result == win32event.WAIT_OBJECT_0:
+                    self._latest_journal = self.scan_latest_journal()
+                    win32event.SetEvent(self._journal_changed)
+                    win32file.FindNextChangeNotification(name_handle)
+                elif result == win32event.WAIT_OBJECT_0 + 1:
+                    win32event.SetEvent(self._journal_changed)
+                    win32file.FindNextChangeNotification(write_handle)
+        except Exception as e:
+            logger.error(f"Error in journal directory watcher: {e}")
+            logger.error(traceback.format_exc())
+        finally:
+            self._watcher_active = False
+            win32file.FindCloseChangeNotification(name_handle)
+            win32file.FindCloseChangeNotification(write_handle)
+    
+    def wait_for_journal_change(self, timeout_ms):
+        """Wait for a journal directory change or a stop request; True means stop."""
+        result = win32event.WaitForMultipleObjects(
+            [self._journal_changed, self._stop_event], False, timeout_ms
+        )
+        return result == win32event.WAIT_OBJECT_0 + 1
+    
+    def stop(self):
+        """Ask the monitoring loop to exit."""
+        win32event.SetEvent(self._stop_event)
+    
+    def _on_console_ctrl(self, ctrl_type):
+        """Stop the monitoring loop on Ctrl+C, Ctrl+Break or console close."""
+        print("\nExiting asteroid tracker...")
+        self.stop()
+        if ctrl_type in (win32con.CTRL_CLOSE_EVENT, win32con.CTRL_LOGOFF_EVENT, win32con.CTRL_SHUTDOWN_EVENT):
+            # Windows ends the process as soon as this returns, so give the
+            # loop time to save first
+            self._stopped.wait(CONSOLE_CLOSE_WAIT)
+        return True
+    
+    def find_latest_journal(self):
+        """Find the latest journal file in the configured directory."""
+        try:
+            # The watcher thread keeps the newest path up to date; only scan
+            # the directory ourselves until it is running (or if it failed)
+            if self._watcher_active:
+                latest_file = self._latest_journal
+            else:
+                latest_file = self.scan_latest_journal()
+            
+            if not latest_file:
+                return None
             
             if self.current_journal_path != latest_file:
                 logger.info(f"New journal file found: {latest_file}")
+                self.close_journal()
                 self.current_journal_path = latest_file
                 self.last_position = 0  # Reset position for new file
-                self.last_line = ""
+                self._tail = bytearray()
             
             return self.current_journal_path
             
@@ -153,76 +406,81 @@ class EliteAsteroidTracker:
             logger.error(traceback.format_exc())
             return None
     
+    def open_journal(self):
+        """Open a handle on the current journal, kept across polls."""
+        # Sequential-scan hint lets the cache manager prefetch ahead of us
+        self._handle = win32file.CreateFile(
+            self.current_journal_path,
+            win32con.GENERIC_READ,
+            win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE,
+            None,
+            win32con.OPEN_EXISTING,
+            win32file.FILE_FLAG_SEQUENTIAL_SCAN,
+            None
+        )
+        # Resume where we left off if the handle is being reopened
+        if self.last_position:
+            win32file.SetFilePointer(self._handle, self.last_position, win32con.FILE_BEGIN)
+        logger.debug(f"Journal handle opened: {self.current_journal_path}")
+    
+    def close_journal(self):
+        """Close the journal handle if one is open."""
+        if self._handle is not None:
+            try:
+                win32file.CloseHandle(self._handle)
+            except Exception as e:
+                logger.error(f"Error closing journal handle: {e}")
+            self._handle = None
+    
     def read_new_journal_entries(self):
         """Read and parse new entries from the journal file."""
-        if not self.current_journal_path or not os.path.exists(self.current_journal_path):
+        if not self.current_journal_path:
             logger.debug("No valid journal path available")
             return []
         
         try:
-            # Use Win32 API for efficient file access
-            handle = win32file.CreateFile(
-                self.current_journal_path,
-                win32con.GENERIC_READ,
-                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE,
-                None,
-                win32con.OPEN_EXISTING,
-                0,
-                None
-            )
+            if self._handle is None:
+                if not os.path.exists(self.current_journal_path):
+                    logger.debug("No valid journal path available")
+                    return []
+                self.open_journal()
             
-            # Get file size and check if new content exists
-            file_size = win32file.GetFileSize(handle)
-            if file_size <= self.last_position:
-                win32file.CloseHandle(handle)
-                return []
+            # Read in fixed-size chunks until EOF; the handle's file pointer
+            # carries our position from one poll to the next
+            entries = []
+            while True:
+                error, data = win32file.ReadFile(self._handle, READ_CHUNK_SIZE)
+                if error:
+                    logger.error(f"Error reading file: {error}")
+                    break
+                if not data:
+                    break
                 
-            # Seek to last read position
-            win32file.SetFilePointer(handle, self.last_position, win32con.FILE_BEGIN)
-            
-            # Read new content
-            error, data = win32file.ReadFile(handle, file_size - self.last_position)
-            win32file.CloseHandle(handle)
-            
-            if error:
-                logger.error(f"Error reading file: {error}")
-                return []
+                self.last_position += len(data)
+                self._tail.extend(data)
                 
-            # Update last read position
-            self.last_position = file_size
-            
-            # Process the data
-            content = data.decode('utf-8', errors='ignore')
-            lines = content.splitlines()
-            
-            # Skip empty results
-            if not lines:
-                return []
+                # Split the raw bytes into lines; the last piece is a partial
+                # line that stays buffered until the rest of it is written
+                raw_lines = self._tail.split(b'\n')
+                self._tail = raw_lines.pop()
                 
-            # If we have a partial last line from before, combine with first line
-            if self.last_line:
-                lines[0] = self.last_line + lines[0]
-                self.last_line = ""
-            
-            # If the last line doesn't end with a newline, it might be incomplete
-            if not content.endswith('\n'):
-                self.last_line = lines.pop()
-            
-            # Parse the journal entries (JSON format)
-            entries = []
-            for line in lines:
-                try:
-                    if line.strip():
-                        entry = json.loads(line)
+                # Parse the journal entries (JSON format) straight from bytes
+                for raw_line in raw_lines:
+                    if not any(tag in raw_line for tag in self._event_tags):
+                        continue
+                    try:
+                        entry = _loads(raw_line)
                         entries.append(entry)
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse journal entry: {line[:100]}...")
+                    except ValueError:
+                        line = raw_line[:100].decode('utf-8', errors='ignore')
+                        logger.warning(f"Failed to parse journal entry: {line}...")
             
             return entries
             
         except Exception as e:
             logger.error(f"Error reading journal entries: {e}")
             logger.error(traceback.format_exc())
+            self.close_journal()
             return []
     
     def speak_text(self, text):
@@ -231,27 +489,34 @@ class EliteAsteroidTracker:
             # Print to console
             print(f"ANNOUNCEMENT: {text}")
             
-            # Use a separate thread for TTS to avoid blocking
-            def speak_thread():
-                try:
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                except Exception as e:
-                    logger.error(f"Error in TTS thread: {e}")
-            
-            threading.Thread(target=speak_thread).start()
+            # Queue for the speaker thread to avoid blocking
+            self._speak_q.put(text)
             logger.info(f"TTS announcement: {text}")
             
         except Exception as e:
             logger.error(f"Error in speak_text: {e}")
             logger.error(traceback.format_exc())
     
+    def _speaker_loop(self):
+        """Speak queued announcements one at a time."""
+        # SAPI is a COM server, so this thread needs its own COM apartment
+        pythoncom.CoInitialize()
+        while True:
+            text = self._speak_q.get()
+            try:
+                if self._engine is None:
+                    self._engine = pyttsx3.init()
+                    self._engine.setProperty('rate', self.config['voice_rate'])
+                    self._engine.setProperty('volume', self.config['voice_volume'])
+                    logger.info("TTS engine initialized")
+                self._engine.say(text)
+                self._engine.runAndWait()
+            except Exception as e:
+                logger.error(f"Error in TTS thread: {e}")
+    
     def process_asteroid(self, entry):
         """Process a ProspectedAsteroid event and announce if valuable."""
         try:
-            if entry.get('event') != 'ProspectedAsteroid':
-                return
-            
             # Check if remaining is 100%
             remaining = entry.get('Remaining', 0)
             if remaining < 100.0:
@@ -259,19 +524,20 @@ class EliteAsteroidTracker:
                 
             materials = entry.get('Materials', [])
             found_valuable = False
+            check_material = self._check_material
             
             # Check for valuable materials
             for material in materials:
-                material_name = material.get('Name', '')
-                proportion = material.get('Proportion', 0.0)
+                material_name = material['Name']
+                proportion = material['Proportion']
                 
                 # Check if this is a target material with sufficient percentage
-                if material_name in self.config['target_materials'] and proportion >= self.config['target_materials'][material_name]:
+                if check_material(material_name, proportion):
                     found_valuable = True
                     
                     # Record in statistics
                     self.record_asteroid(
-                        entry.get('timestamp', datetime.now().isoformat()),
+                        entry.get('timestamp') or _fast_now(),
                         material_name,
                         proportion,
                         'MotherlodeMaterial' in entry and entry['MotherlodeMaterial'] == material_name,
@@ -294,17 +560,20 @@ class EliteAsteroidTracker:
     def record_asteroid(self, timestamp, material, proportion, is_motherlode, content_type, remaining):
         """Record asteroid information in statistics."""
         try:
-            new_row = pd.DataFrame([{
+            row = {
                 'timestamp': timestamp,
                 'material': material,
                 'proportion': proportion,
                 'motherlode': is_motherlode,
                 'content_type': content_type,
                 'remaining': remaining
-            }])
+            }
             
-            self.stats = pd.concat([self.stats, new_row], ignore_index=True)
-            self.save_stats()
+            # Hand the row to the writer thread; rows recorded before the
+            # stats are first loaded are picked up from the CSV instead
+            self._write_q.put(row)
+            if self._stats_loaded:
+                self.append_stat(timestamp, material, proportion, is_motherlode, content_type, remaining)
             
         except Exception as e:
             logger.error(f"Error recording asteroid: {e}")
@@ -313,26 +582,31 @@ class EliteAsteroidTracker:
     def display_stats(self):
         """Display mining statistics."""
         try:
-            if len(self.stats) == 0:
+            if not self._stats_loaded:
+                self.load_stats()
+            
+            n = self._n
+            if n == 0:
                 print("No asteroid statistics recorded yet.")
                 return
                 
-            # Group by material and calculate averages
-            material_stats = self.stats.groupby('material').agg({
-                'proportion': ['count', 'mean', 'max'],
-                'motherlode': 'sum'
-            })
+            # Group by material in one pass over the column arrays
+            cols = self._cols
+            materials, codes = np.unique(cols['material'], return_inverse=True)
+            count, total, peak, motherlodes = _aggregate_materials(
+                codes,
+                cols['proportion'][:n],
+                cols['motherlode'][:n],
+                len(materials)
+            )
             
             print("\n=== Mining Statistics ===")
-            print(f"Total asteroids prospected: {len(self.stats)}")
+            print(f"Total asteroids prospected: {n}")
             
-            for material, stats in material_stats.iterrows():
-                count = stats[('proportion', 'count')]
-                avg_prop = stats[('proportion', 'mean')]
-                max_prop = stats[('proportion', 'max')]
-                motherlodes = stats[('motherlode', 'sum')]
-                
-                print(f"{material}: {count} found, avg: {avg_prop:.1f}%, max: {max_prop:.1f}%, motherlodes: {motherlodes}")
+            for i, material in enumerate(materials):
+                avg_prop = total[i] / count[i] / PROPORTION_SCALE
+                max_prop = peak[i] / PROPORTION_SCALE
+                print(f"{material}: {count[i]} found, avg: {avg_prop:.1f}%, max: {max_prop:.1f}%, motherlodes: {motherlodes[i]}")
                 
             print("========================\n")
             
@@ -352,12 +626,25 @@ class EliteAsteroidTracker:
         print(f"Looking for: {', '.join(f'{m} ({p}%+)' for m, p in self.config['target_materials'].items())}")
         print("Press Ctrl+C to exit\n")
         
+        # Entries passed to a handler, summarized on one line every
+        # STATUS_INTERVAL. Only prefiltered lines reach this loop, so this
+        # counts prospected asteroids rather than journal events in general
+        processed = 0
+        last_status = time.monotonic()
+        
+        # Console events end the wait below at once instead of waiting for a
+        # KeyboardInterrupt that a blocking Win32 wait cannot deliver
+        self._stopped = threading.Event()
+        win32api.SetConsoleCtrlHandler(self._on_console_ctrl, True)
+        
         try:
             while True:
                 # Find latest journal file
                 journal_path = self.find_latest_journal()
                 if not journal_path:
-                    time.sleep(1)  # Wait longer if no journal found
+                    # Wait longer if no journal found
+                    if self.wait_for_journal_change(1000):
+                        break
                     continue
                 
                 # Read new entries
@@ -365,18 +652,34 @@ class EliteAsteroidTracker:
                 
                 # Process each entry
                 for entry in entries:
-                    print(f"Processing: {entry.get('event', 'Unknown')} - {entry.get('timestamp', 'No timestamp')}")
-                    
-                    # Process ProspectedAsteroid events
-                    if entry.get('event') == 'ProspectedAsteroid':
-                        self.process_asteroid(entry)
+                    # Dispatch to the handler registered for this event
+                    handler = self._handlers.get(entry.get('event'))
+                    if handler is not None:
+                        handler(entry)
+                        processed += 1
+                
+                # Report processed asteroids in a single line instead of one per entry
+                now = time.monotonic()
+                if now - last_status >= STATUS_INTERVAL:
+                    if processed:
+                        print(f"Processed {processed} prospected asteroids")
+                        logger.debug(f"Processed {processed} prospected asteroids")
+                        processed = 0
+                    last_status = now
                 
                 # Periodically display stats (every 100 cycles)
                 # if random.randint(0, 100) == 0:
                 #    self.display_stats()
                 
-                # Sleep for the configured polling frequency
-                time.sleep(self.config['polling_frequency'])
+                # Sleep until the journal directory changes. Notifications for
+                # a journal Elite holds open can lag behind its writes, so the
+                # wait stays bounded by the polling interval and a change can
+                # only cut it short
+                timeout_ms = int(self.config['polling_frequency'] * 1000)
+                if self.wait_for_journal_change(timeout_ms):
+                    break
+            
+            self.save_stats()
                 
         except KeyboardInterrupt:
             print("\nExiting asteroid tracker...")
@@ -386,6 +689,11 @@ class EliteAsteroidTracker:
             logger.error(traceback.format_exc())
             print(f"Error: {e}. See debug log for details.")
             self.save_stats()
+        finally:
+            win32api.SetConsoleCtrlHandler(self._on_console_ctrl, False)
+            self.close_journal()
+            self._csv_file.close()
+            self._stopped.set()
 
 # Additional functionality for future expansion
 def analyze_historical_data():
@@ -1,26 +1,36 @@
 #!/usr/bin/env python3
 import os
 import sys
+import csv
 import json
 import time
+import queue
 import threading
 import glob
+import mmap
 import re
 import logging
 from datetime import datetime
 import pickle
 
 try:
-    import pandas as pd
+    import pyttsx3
 except ImportError:
-    print("pandas is required. Install with: pip install pandas")
+    print("pyttsx3 is required. Install with: pip install pyttsx3")
     sys.exit(1)
 
+# orjson is optional; both parsers raise a ValueError subclass on bad input
 try:
-    import pyttsx3
+    from orjson import loads as json_loads
 except ImportError:
-    print("pyttsx3 is required. Install with: pip install pyttsx3")
-    sys.exit(1)
+    json_loads = json.loads
+
+# watchdog is optional; without it the main loop just polls the journal
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
 
 # Configure logging
 logging.basicConfig(
@@ -28,11 +38,17 @@ logging.basicConfig(
     format='[%(asctime)s] %(levelname)s: %(message)s',
     datefmt='%H:%M:%S'
 )
+logger = logging.getLogger(__name__)
 
 # Configuration
 CONFIG_PATH = "config.json"
 MINING_CONFIG_PATH = "mining.json"
 
+MAX_IDLE_WAIT = 1.0  # seconds; idle wait while no journal is open
+
+# Phrases that mark an NPC message as a pirate threat
+PIRATE_PATTERN = re.compile(r"cargo|surrender|let me see|hand over|pirate", re.IGNORECASE)
+
 def load_config(path, defaults=None):
     """Load config file or return defaults"""
     if defaults is None:
@@ -46,53 +62,75 @@ def load_config(path, defaults=None):
             try:
                 with open(path, "w", encoding="utf-8") as f:
                     json.dump(defaults, f, indent=2)
-                logging.info(f"Created new config file: {path}")
+                logger.info("Created new config file: %s", path)
             except Exception as ex:
-                logging.error(f"Failed to create config: {ex}")
+                logger.error("Failed to create config: %s", ex)
         return defaults
     except Exception as ex:
-        logging.error(f"Failed to load {path}: {ex}")
+        logger.error("Failed to load %s: %s", path, ex)
         return defaults
 
+if Observer is not None:
+    class JournalChangeHandler(FileSystemEventHandler):
+        """Wakes the main loop whenever a file in the journal directory changes"""
+        
+        def __init__(self, wake_event):
+            super().__init__()
+            self._wake_event = wake_event
+        
+        def on_modified(self, event):
+            if not event.is_directory:
+                self._wake_event.set()
+        
+        on_created = on_modified
+
 class SimpleTextToSpeech:
-    """Ultra-reliable TTS that creates a new engine for each request"""
+    """Reliable TTS that reuses one engine and recreates it after a failure"""
+    
+    __slots__ = ("_queue", "_engine", "_thread", "_stop")
     
     def __init__(self):
-        self._queue = []
-        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._engine = None
         self._thread = threading.Thread(target=self._worker, daemon=True)
         self._stop = threading.Event()
         self._thread.start()
-        logging.info("TTS system initialized")
+        logger.info("TTS system initialized")
     
     def speak(self, text):
         """Queue text for speaking"""
-        with self._lock:
-            self._queue.append(text)
-            logging.info(f"TTS queued: {text}")
+        self._queue.put(text)
+        logger.info("TTS queued: %s", text)
     
     def _worker(self):
         """Process speech queue"""
         while not self._stop.is_set():
-            text = None
-            with self._lock:
-                if self._queue:
-                    text = self._queue.pop(0)
+            # Block until text arrives; the timeout only bounds how long a
+            # stop request can go unnoticed
+            try:
+                text = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
             
             if text:
-                logging.info(f"TTS speaking: {text}")
+                logger.info("TTS speaking: %s", text)
                 try:
-                    # Create fresh engine each time (more reliable)
-                    engine = pyttsx3.init()
-                    engine.setProperty("rate", 150)  # Slightly slower
-                    engine.setProperty("volume", 1.0)
+                    engine = self._get_engine()
                     engine.say(text)
                     engine.runAndWait()
-                    del engine  # Clean up
                 except Exception as ex:
-                    logging.error(f"TTS error: {ex}")
-            else:
-                time.sleep(0.1)
+                    logger.error("TTS error: %s", ex)
+                    # Start the next message with a fresh engine
+                    self._engine = None
+    
+    def _get_engine(self):
+        """Return the shared engine, creating it on first use"""
+        # Created on the worker thread, the only thread that ever uses it
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty("rate", 150)  # Slightly slower
+            self._engine.setProperty("volume", 1.0)
+        return self._engine
     
     def stop(self):
         """Stop the TTS worker"""
@@ -103,30 +141,66 @@ class SimpleTextToSpeech:
 class MiningData:
     """Stores and manages mining data"""
     
-    def __init__(self):
-        self.df = pd.DataFrame(columns=["timestamp", "material", "proportion"])
+    __slots__ = ("path", "_file", "_csv_writer", "_count", "last_save")
+    
+    COLUMNS = ["timestamp", "material", "proportion"]
+    
+    def __init__(self, path="mining_data.csv"):
+        # Rows are appended to the CSV as they arrive; the file is opened
+        # on the first add and saving only has to flush it
+        self.path = path
+        self._file = None
+        self._csv_writer = None
+        self._count = 0
         self.last_save = time.time()
     
+    def _writer(self):
+        """Return the CSV writer, opening the file in append mode on first use"""
+        if self._csv_writer is None:
+            self._file = open(self.path, "a", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._file)
+            if self._file.tell() == 0:
+                self._csv_writer.writerow(self.COLUMNS)
+        return self._csv_writer
+    
     def add_material(self, timestamp, material, proportion):
         """Add a material entry"""
-        new_row = pd.DataFrame([{
-            "timestamp": timestamp,
-            "material": material,
-            "proportion": proportion
-        }])
-        self.df = pd.concat([self.df, new_row], ignore_index=True)
+        self._writer().writerow((timestamp, material, proportion))
+        self._count += 1
     
-    def save(self, path="mining_data.csv"):
-        """Save data to CSV"""
+    def add_materials(self, timestamp, items):
+        """Add several (material, proportion) entries sharing one timestamp"""
+        rows = [(timestamp, material, proportion) for material, proportion in items]
+        self._writer().writerows(rows)
+        self._count += len(rows)
+    
+    def save(self):
+        """Flush appended rows to the CSV"""
         try:
-            self.df.to_csv(path, index=False)
-            logging.info(f"Saved mining data: {len(self.df)} records")
+            if self._file is not None:
+                self._file.flush()
+            logger.info("Saved mining data: %d records", self._count)
         except Exception as ex:
-            logging.error(f"Failed to save mining data: {ex}")
+            logger.error("Failed to save mining data: %s", ex)
+    
+    def close(self):
+        """Flush and close the CSV"""
+        self.save()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._csv_writer = None
 
 class EliteAssistant:
     """Main application class"""
     
+    __slots__ = (
+        "config", "mining_thresholds", "journal_dir", "poll_interval",
+        "tts", "mining_data", "current_file", "_fh", "_mm", "_pos",
+        "_journal_dir_mtime", "_cached_latest", "stop_flag",
+        "_journal_event", "_observer",
+    )
+    
     def __init__(self):
         # Default configuration with CORRECT path for Filipe
         default_config = {
@@ -148,85 +222,126 @@ class EliteAssistant:
         self.tts = SimpleTextToSpeech()
         self.mining_data = MiningData()
         self.current_file = None
-        self.last_position = 0
-        self.last_line = None
+        self._fh = None
+        self._mm = None
+        self._pos = 0
+        self._journal_dir_mtime = None
+        self._cached_latest = None
         self.stop_flag = threading.Event()
+        self._journal_event = threading.Event()
+        self._observer = None
         
         # Print startup information
-        logging.info(f"Journal directory: {self.journal_dir}")
-        logging.info(f"Mining thresholds: {self.mining_thresholds}")
+        logger.info("Journal directory: %s", self.journal_dir)
+        logger.info("Mining thresholds: %s", self.mining_thresholds)
     
     def find_latest_journal(self):
         """Find the most recent journal file"""
         try:
-            if not os.path.exists(self.journal_dir):
-                logging.error(f"Journal directory does not exist: {self.journal_dir}")
-                return None
-                
-            files = [f for f in os.listdir(self.journal_dir) 
-                    if f.startswith("Journal.") and f.endswith(".log")]
-            if not files:
-                logging.warning(f"No journal files found in {self.journal_dir}")
+            # New journals change the directory's mtime, so only rescan
+            # when it has moved since the last scan; the same stat call
+            # doubles as the existence check
+            try:
+                mtime = os.stat(self.journal_dir).st_mtime
+            except FileNotFoundError:
+                logger.error("Journal directory does not exist: %s", self.journal_dir)
                 return None
+            if mtime == self._journal_dir_mtime:
+                return self._cached_latest
                 
-            files.sort(key=lambda f: os.path.getmtime(os.path.join(self.journal_dir, f)), 
-                      reverse=True)
-            latest_file = os.path.join(self.journal_dir, files[0])
+            # scandir entries carry their own path and cache their stat()
+            with os.scandir(self.journal_dir) as entries:
+                files = [e for e in entries
+                        if e.name.startswith("Journal.") and e.name.endswith(".log")]
+            if files:
+                latest_file = max(files, key=lambda e: e.stat().st_mtime).path
+            else:
+                logger.warning("No journal files found in %s", self.journal_dir)
+                latest_file = None
+            
+            self._journal_dir_mtime = mtime
+            self._cached_latest = latest_file
             return latest_file
         except Exception as ex:
-            logging.error(f"Error finding journal files: {ex}")
+            logger.error("Error finding journal files: %s", ex)
             return None
     
+    def open_journal(self, path):
+        """Switch the persistent handle to another journal file"""
+        logger.info("Switching to journal: %s", path)
+        self.close_journal()
+        self.current_file = path
+        try:
+            self._fh = open(path, "rb")
+            # Start at end of file for new journals
+            self._pos = os.fstat(self._fh.fileno()).st_size
+        except Exception as ex:
+            logger.error("Failed to open journal: %s", ex)
+            self._fh = None
+            self.current_file = None
+    
+    def close_journal(self):
+        """Close the persistent journal handle"""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+    
     def read_new_lines(self):
         """Read new lines from the current journal file"""
+        # The handle stays open between polls; checking for a newer journal
+        # costs a single stat of the directory unless it has changed
         latest = self.find_latest_journal()
-        if not latest:
+        if latest and latest != self.current_file:
+            self.open_journal(latest)
+        
+        if self._fh is None:
             return []
-            
-        # Check if journal file has changed
-        if latest != self.current_file:
-            logging.info(f"Switching to journal: {latest}")
-            self.current_file = latest
-            # Start at end of file for new journals
-            try:
-                self.last_position = os.path.getsize(latest)
-            except:
-                self.last_position = 0
         
         try:
-            with open(self.current_file, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(self.last_position)
-                lines = f.readlines()
-                self.last_position = f.tell()
+            size = os.fstat(self._fh.fileno()).st_size
+            if size <= self._pos:
+                return []
+            
+            # Map the journal read-only and remap whenever it has grown past
+            # the current view; lines are sliced out as bytes without copying
+            # through a text buffer
+            if self._mm is None or size > len(self._mm):
+                if self._mm is not None:
+                    self._mm.close()
+                self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            mm = self._mm
+            
+            # Only complete lines are consumed; a partial last line is left
+            # for the next poll
+            result = []
+            pos = self._pos
+            while True:
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    break
+                line = mm[pos:end].strip()
+                pos = end + 1
                 
-                # Filter duplicates and empty lines
-                result = []
-                for line in lines:
-                    line = line.strip()
-                    if not line or line == self.last_line:
-                        continue
-                    self.last_line = line
+                # Filter empty lines; the byte offset already guarantees no
+                # line is read twice from the same file
+                if line:
                     result.append(line)
-                
-                return result
+            self._pos = pos
+            
+            return result
         except Exception as ex:
-            logging.error(f"Error reading journal: {ex}")
+            logger.error("Error reading journal: %s", ex)
             return []
     
-    def handle_mining(self, line):
+    def handle_mining(self, data):
         """Process mining events"""
-        if '"event":"ProspectedAsteroid"' not in line:
-            return False
-        
         try:
-            # Try to parse as JSON
-            data = json.loads(line)
-            if data.get("event") != "ProspectedAsteroid":
-                return False
-                
             # Get materials array
             materials = data.get("Materials", [])
-            timestamp = data.get("timestamp", datetime.now().isoformat())
+            timestamp = data.get("timestamp") or datetime.now().isoformat()
             
             if not materials:
                 return False
@@ -237,175 +352,170 @@ class EliteAssistant:
             print(f"{timestamp}")
             print("-" * 40)
             
-            # Process materials
-            for mat in materials:
-                name = mat.get("Name", "")
-                proportion = mat.get("Proportion", 0)
-                if not name:
-                    continue
-                
-                # Convert to percentage
-                #percent = int(float(proportion) * 100) if isinstance(proportion, float) else int(proportion)
-                percent = int(float(proportion) ) if isinstance(proportion, float) else int(proportion)
-                
-                # Log to terminal
-                logging.info(f"[MINING] {name}: {percent}%")
-                
-                # Check threshold for TTS
-                threshold = self.mining_thresholds.get(name)
-                if threshold is not None and percent >= threshold:
-                    message = f"{name} found at {percent} percent"
-                    logging.info(f"[ALERT] {message}")
-                    self.tts.speak(message)
-                
-                # Store in dataset
-                self.mining_data.add_material(timestamp, name, percent)
-            
+            self._process_materials(materials, timestamp)
             return True
-        except json.JSONDecodeError:
-            # Try regex as fallback
-            materials_match = re.search(r'"Materials"\s*:\s*(\[.*?\])', line)
-            timestamp_match = re.search(r'"timestamp"\s*:\s*"([^"]+)"', line)
-            
-            if not materials_match:
-                return False
-                
-            try:
-                materials = json.loads(materials_match.group(1))
-                timestamp = timestamp_match.group(1) if timestamp_match else datetime.now().isoformat()
-                
-                # Print header
-                print("\n" + "-" * 40)
-                print(f"New prospected Asteroid (regex parsed)")
-                print(f"{timestamp}")
-                print("-" * 40)
-                
-                # Process materials with regex
-                for mat in materials:
-                    name = mat.get("Name", "")
-                    proportion = mat.get("Proportion", 0)
-                    if not name:
-                        continue
-                    
-                    # Convert to percentage
-                    #percent = int(float(proportion) * 100) if isinstance(proportion, float) else int(proportion)
-                    percent = int(float(proportion)) if isinstance(proportion, float) else int(proportion)
-                    
-                    # Log to terminal
-                    logging.info(f"[MINING] {name}: {percent}%")
-                    
-                    # Check threshold for TTS
-                    threshold = self.mining_thresholds.get(name)
-                    if threshold is not None and percent >= threshold:
-                        message = f"{name} found at {percent} percent"
-                        logging.info(f"[ALERT] {message}")
-                        self.tts.speak(message)
-                    
-                    # Store in dataset
-                    self.mining_data.add_material(timestamp, name, percent)
-                
-                return True
-            except Exception as ex:
-                logging.error(f"Failed to parse mining data with regex: {ex}")
-                return False
         except Exception as ex:
-            logging.error(f"Error in mining handler: {ex}")
+            logger.error("Error in mining handler: %s", ex)
             return False
     
-    def handle_message(self, line):
-        """Process message events"""
-        if '"event":"ReceiveText"' not in line:
-            return False
+    def _process_materials(self, materials, timestamp):
+        """Log, announce and store the materials of one prospected asteroid"""
+        # Rows and alerts are collected here and flushed in one batch
+        items = []
+        alerts = []
+        for mat in materials:
+            name = mat.get("Name", "")
+            proportion = mat.get("Proportion", 0)
+            if not name:
+                continue
+            
+            # Convert to percentage
+            #percent = int(float(proportion) * 100) if isinstance(proportion, float) else int(proportion)
+            percent = int(float(proportion) ) if isinstance(proportion, float) else int(proportion)
+            
+            # Log to terminal
+            logger.info("[MINING] %s: %d%%", name, percent)
+            
+            # Check threshold for TTS
+            threshold = self.mining_thresholds.get(name)
+            if threshold is not None and percent >= threshold:
+                alert = f"{name} at {percent} percent"
+                logger.info("[ALERT] %s", alert)
+                alerts.append(alert)
+            
+            items.append((name, percent))
+        
+        if alerts:
+            self.tts.speak("Found " + ", ".join(alerts))
         
+        # Store in dataset
+        self.mining_data.add_materials(timestamp, items)
+    
+    def handle_message(self, data):
+        """Process message events"""
         try:
-            data = json.loads(line)
-            if data.get("event") != "ReceiveText":
-                return False
-                
             sender = data.get("From", "Unknown")
             message = data.get("Message", "")
-            channel = data.get("Channel", "").lower()
+            # The journal always writes channel names in lowercase
+            channel = data.get("Channel", "")
             
             if channel == "squadron":
                 msg = f"message from squadron member {sender} saying: {message}"
-                logging.info(msg)
+                logger.info(msg)
                 self.tts.speak(msg)
                 return True
             
             elif channel == "npc":
-                msg_lower = message.lower()
-                pirate_words = ["cargo", "surrender", "let me see", "hand over", "pirate"]
-                
-                if any(word in msg_lower for word in pirate_words):
+                if PIRATE_PATTERN.search(message):
                     msg = f"NPC PIRATE MESSAGE: {message}"
                 else:
                     msg = f"NPC message: {message}"
                     
-                logging.info(msg)
+                logger.info(msg)
                 self.tts.speak(msg)
                 return True
                 
             elif channel == "player":
                 msg = f"player message from {sender} saying: {message}"
-                logging.info(msg)
+                logger.info(msg)
                 self.tts.speak(msg)
                 return True
                 
-        except json.JSONDecodeError:
-            # Try regex fallback for messages
-            from_match = re.search(r'"From"\s*:\s*"([^"]+)"', line)
-            message_match = re.search(r'"Message"\s*:\s*"([^"]+)"', line)
-            channel_match = re.search(r'"Channel"\s*:\s*"([^"]+)"', line)
-            
-            if from_match and message_match and channel_match:
-                sender = from_match.group(1)
-                message = message_match.group(1)
-                channel = channel_match.group(1).lower()
-                
-                if channel == "squadron":
-                    msg = f"message from squadron member {sender} saying: {message}"
-                    logging.info(msg)
-                    self.tts.speak(msg)
-                    return True
-                
-                # Handle other channels similarly...
         except Exception as ex:
-            logging.error(f"Error in message handler: {ex}")
+            logger.error("Error in message handler: %s", ex)
             
         return False
     
+    # Journal event name -> handler, looked up once per parsed line
+    HANDLERS = {
+        "ProspectedAsteroid": handle_mining,
+        "ReceiveText": handle_message,
+    }
+    
+    # Finds a handled event name in one scan over the raw line, so lines for
+    # any other event are skipped without being parsed
+    EVENT_PATTERN = re.compile(
+        rb'"event":"(' + b"|".join(re.escape(name.encode()) for name in HANDLERS) + rb')"'
+    )
+    
+    # Byte tags an event's line must contain to be worth parsing, so chatter
+    # on channels handle_message ignores never reaches the JSON decoder. The
+    # match is exact, like the channel comparisons in handle_message
+    PREFILTERS = {
+        "ReceiveText": (
+            b'"Channel":"squadron"',
+            b'"Channel":"npc"',
+            b'"Channel":"player"',
+        ),
+    }
+    
+    def start_watcher(self):
+        """Watch the journal directory so the main loop wakes on writes"""
+        if Observer is None:
+            logger.info("watchdog not installed, polling the journal")
+            return
+        try:
+            self._observer = Observer()
+            self._observer.schedule(JournalChangeHandler(self._journal_event),
+                                    self.journal_dir, recursive=False)
+            self._observer.start()
+            logger.info("Watching journal directory for changes")
+        except Exception as ex:
+            logger.error("Failed to watch journal directory: %s", ex)
+            self._observer = None
+    
+    def stop_watcher(self):
+        """Stop the journal directory watcher"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=1.0)
+            self._observer = None
+    
     def run(self):
         """Main application loop"""
-        logging.info("Elite Dangerous Assistant starting...")
+        logger.info("Elite Dangerous Assistant starting...")
         self.tts.speak("Elite Dangerous Assistant ready")
+        self.start_watcher()
         
         try:
             while not self.stop_flag.is_set():
                 lines = self.read_new_lines()
                 
                 if not lines:
-                    time.sleep(self.poll_interval)
+                    # Writes to a journal Elite holds open may not raise a
+                    # watchdog event until the cache flushes, so the wait is
+                    # bounded by poll_interval and an event only cuts it short.
+                    # Wait longer only while there is no journal to tail
+                    wait = self.poll_interval if self._fh is not None else max(self.poll_interval, MAX_IDLE_WAIT)
+                    if self._journal_event.wait(wait):
+                        self._journal_event.clear()
                     continue
                 
                 for line in lines:
+                    match = self.EVENT_PATTERN.search(line)
+                    if match is None:
+                        continue
+                    event = match.group(1).decode()
+                    tags = self.PREFILTERS.get(event)
+                    if tags is not None and not any(tag in line for tag in tags):
+                        continue
+                    
+                    # Journals are written as JSON, so a line that does not
+                    # decode is not worth recovering by hand. ValueError also
+                    # covers the UnicodeDecodeError json.loads raises on bytes
+                    # that are not valid UTF-8
+                    try:
+                        data = json_loads(line)
+                    except ValueError:
+                        logger.debug("Skipping malformed journal line: %r", line[:100])
+                        continue
+                    
                     try:
-                        # Try each handler
-                        handled = (
-                            self.handle_mining(line) or
-                            self.handle_message(line)
-                        )
-                        
-                        # Add additional debugging if needed
-                        if not handled and '"event"' in line:
-                            try:
-                                data = json.loads(line)
-                                event = data.get("event")
-                                if event not in ("Music", "Status", "NavRoute"):  # Skip noisy events
-                                    logging.debug(f"Unhandled event: {event}")
-                            except:
-                                pass
+                        # Dispatch on the matched event name
+                        handler = self.HANDLERS[event]
+                        handler(self, data)
                     except Exception as ex:
-                        logging.error(f"Error processing line: {ex}")
+                        logger.error("Error processing line: %s", ex)
                 
                 # Periodic save
                 now = time.time()
@@ -414,17 +524,19 @@ class EliteAssistant:
                     self.mining_data.last_save = now
                     
         except KeyboardInterrupt:
-            logging.info("Interrupted by user")
+            logger.info("Interrupted by user")
         finally:
             self.stop_flag.set()
             self.shutdown()
     
     def shutdown(self):
         """Clean shutdown"""
-        logging.info("Shutting down...")
-        self.mining_data.save()
+        logger.info("Shutting down...")
+        self.stop_watcher()
+        self.mining_data.close()
+        self.close_journal()
         self.tts.stop()
-        logging.info("Goodbye!")
+        logger.info("Goodbye!")
 
 # Start the application
 if __name__ == "__main__":